@@ -0,0 +1,168 @@
+# app/archive.py
+"""
+Hot/cold partitioning of performance records.
+
+Records older than ARCHIVE_AFTER_DAYS are moved in batches from
+`driver_performances` (hot) to `driver_performances_archive` (cold) by the
+periodic `performance_archive` job, keeping the hot table small. Reads that
+reach back past the archive watermark (the newest archived date) also query
+the archive table, so callers see one continuous history.
+"""
+import os
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .jobs import JobContext, job_handler, schedule_periodic
+
+# ------------------
+# Configuration
+# ------------------
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+# How often the archive job is queued automatically; 0 disables it
+ARCHIVE_INTERVAL_HOURS = float(os.getenv("ARCHIVE_INTERVAL_HOURS", "24"))
+
+_COLUMNS = ("id", "driver_id", "date", "rating", "notes")
+
+
+def default_cutoff() -> date:
+    return date.today() - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+
+def archive_watermark(db: Session) -> Optional[date]:
+    """Returns the newest date held in the archive, or None if it is empty."""
+    return db.query(func.max(models.DriverPerformanceArchive.date)).scalar()
+
+
+def _move_batches(db: Session, source, target, query, batch_size: int,
+                  on_batch: Optional[Callable[[int], None]]) -> int:
+    # Each batch is copied with INSERT ... SELECT and then deleted from the
+    # source in the same transaction, so a record is never in both tables.
+    moved = 0
+    while True:
+        ids = [row.id for row in query.order_by(source.id).limit(batch_size)]
+        if not ids:
+            break
+        source_columns = [getattr(source, name) for name in _COLUMNS]
+        db.execute(
+            insert(target).from_select(list(_COLUMNS), select(*source_columns).where(source.id.in_(ids)))
+        )
+        db.query(source).filter(source.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        moved += len(ids)
+        if on_batch:
+            on_batch(moved)
+    return moved
+
+
+def archive_performances(db: Session, cutoff: Optional[date] = None, batch_size: int = ARCHIVE_BATCH_SIZE,
+                         on_batch: Optional[Callable[[int], None]] = None) -> int:
+    """Moves performance records dated before `cutoff` to the archive. Returns the number moved."""
+    cutoff = cutoff or default_cutoff()
+    query = db.query(models.DriverPerformance.id).filter(models.DriverPerformance.date < cutoff)
+    return _move_batches(db, models.DriverPerformance, models.DriverPerformanceArchive,
+                         query, batch_size, on_batch)
+
+
+def restore_performances(db: Session, driver_id: Optional[int] = None, start_date: Optional[date] = None,
+                         end_date: Optional[date] = None, batch_size: int = ARCHIVE_BATCH_SIZE,
+                         on_batch: Optional[Callable[[int], None]] = None) -> int:
+    """Moves matching archived records back to the hot table. Returns the number restored."""
+    query = _filter_records(db.query(models.DriverPerformanceArchive.id), models.DriverPerformanceArchive,
+                            driver_id, start_date, end_date)
+    return _move_batches(db, models.DriverPerformanceArchive, models.DriverPerformance,
+                         query, batch_size, on_batch)
+
+
+def _filter_records(query, model, driver_id=None, start_date=None, end_date=None):
+    if driver_id is not None:
+        query = query.filter(model.driver_id == driver_id)
+    if start_date:
+        query = query.filter(model.date >= start_date)
+    if end_date:
+        query = query.filter(model.date <= end_date)
+    return query
+
+
+def get_performance_history(db: Session, driver_id: int, start_date: Optional[date] = None,
+                            end_date: Optional[date] = None) -> List:
+    """
+    Returns a driver's performance records in the given date range, reading
+    the archive only when the range starts on or before the archive watermark.
+    """
+    query = _filter_records(db.query(models.DriverPerformance), models.DriverPerformance,
+                            driver_id, start_date, end_date)
+    records = query.order_by(models.DriverPerformance.date).execution_options(hot_query="driver_history").all()
+
+    watermark = archive_watermark(db)
+    if watermark is not None and (start_date is None or start_date <= watermark):
+        archive_query = _filter_records(db.query(models.DriverPerformanceArchive), models.DriverPerformanceArchive,
+                                        driver_id, start_date, end_date)
+        archived = archive_query.order_by(models.DriverPerformanceArchive.date).execution_options(
+            hot_query="driver_history_archive"
+        ).all()
+        # Partial restores leave hot and archived rows interleaved in time
+        records = sorted(archived + records, key=lambda record: (record.date, record.id))
+    return records
+
+
+def table_stats(db: Session) -> dict:
+    return {
+        "hot_rows": db.query(func.count(models.DriverPerformance.id)).scalar(),
+        "archived_rows": db.query(func.count(models.DriverPerformanceArchive.id)).scalar(),
+        "oldest_hot_date": db.query(func.min(models.DriverPerformance.date)).scalar(),
+        "archive_watermark": archive_watermark(db),
+        "cutoff": default_cutoff(),
+    }
+
+
+# ------------------
+# Background jobs
+# ------------------
+def _progress_reporter(ctx: JobContext, total: int, verb: str):
+    total = total or 1
+    return lambda done: ctx.report_progress(done * 100 // total, f"{done} records {verb}")
+
+
+def _validate_archive_params(params: dict):
+    if params.get("cutoff"):
+        date.fromisoformat(params["cutoff"])
+
+
+def _validate_restore_params(params: dict):
+    if params.get("driver_id") is not None:
+        int(params["driver_id"])
+    for name in ("start_date", "end_date"):
+        if params.get(name):
+            date.fromisoformat(params[name])
+
+
+# Admin-only, like the /admin/archive routes that queue them
+@job_handler("performance_archive", admin_only=True, validate_params=_validate_archive_params)
+def performance_archive_job(ctx: JobContext):
+    """Optional params: `cutoff` (ISO date), defaults to today minus ARCHIVE_AFTER_DAYS."""
+    cutoff = date.fromisoformat(ctx.params["cutoff"]) if ctx.params.get("cutoff") else default_cutoff()
+    total = ctx.db.query(func.count(models.DriverPerformance.id)).filter(
+        models.DriverPerformance.date < cutoff
+    ).scalar()
+    archive_performances(ctx.db, cutoff, on_batch=_progress_reporter(ctx, total, "archived"))
+
+
+@job_handler("performance_restore", admin_only=True, validate_params=_validate_restore_params)
+def performance_restore_job(ctx: JobContext):
+    """Optional params: `driver_id`, `start_date` and `end_date` (ISO dates)."""
+    driver_id = ctx.params.get("driver_id")
+    start_date = date.fromisoformat(ctx.params["start_date"]) if ctx.params.get("start_date") else None
+    end_date = date.fromisoformat(ctx.params["end_date"]) if ctx.params.get("end_date") else None
+    total = _filter_records(ctx.db.query(func.count(models.DriverPerformanceArchive.id)),
+                            models.DriverPerformanceArchive, driver_id, start_date, end_date).scalar()
+    restore_performances(ctx.db, driver_id, start_date, end_date,
+                         on_batch=_progress_reporter(ctx, total, "restored"))
+
+
+if ARCHIVE_INTERVAL_HOURS > 0:
+    schedule_periodic("performance_archive", ARCHIVE_INTERVAL_HOURS * 3600)
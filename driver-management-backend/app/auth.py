@@ -1,5 +1,8 @@
+import os
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -12,13 +15,104 @@ from .schemas import TokenData
 # ------------------
 # Password Hashing
 # ------------------
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# The cost profile comes from .env; run calibrate_password_hash.py to pick
+# values that give the target verify time on this host. Stored hashes made
+# with another scheme or cost are upgraded on the next successful login.
+PASSWORD_HASH_SCHEME = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+def build_crypt_context(scheme: str = PASSWORD_HASH_SCHEME, bcrypt_rounds: int = BCRYPT_ROUNDS,
+                        argon2_time_cost: int = ARGON2_TIME_COST, argon2_memory_cost: int = ARGON2_MEMORY_COST,
+                        argon2_parallelism: int = ARGON2_PARALLELISM) -> CryptContext:
+    if scheme not in ("bcrypt", "argon2"):
+        raise ValueError(f"PASSWORD_HASH_SCHEME must be 'bcrypt' or 'argon2', not '{scheme}'.")
+    if scheme == "argon2":
+        from passlib.hash import argon2
+        if not argon2.has_backend():
+            raise ValueError("PASSWORD_HASH_SCHEME=argon2 requires the argon2-cffi package.")
+    # bcrypt stays listed so existing hashes still verify; deprecated="auto"
+    # marks every scheme except the default as needing an update.
+    return CryptContext(
+        schemes=["argon2", "bcrypt"] if scheme == "argon2" else ["bcrypt"],
+        default=scheme,
+        deprecated="auto",
+        # Pinning min and max to the configured cost makes needs_update()
+        # report hashes made with any other number of rounds.
+        bcrypt__rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+pwd_context = build_crypt_context()
+
+class HashTimings:
+    """Counts and times password hashing work, for capacity planning."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {kind: {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+                       for kind in ("verify", "hash", "rehash")}
+
+    def record(self, kind: str, seconds: float):
+        with self._lock:
+            stats = self._stats[kind]
+            stats["count"] += 1
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                kind: {
+                    "count": stats["count"],
+                    "total_ms": round(stats["total_seconds"] * 1000, 2),
+                    "avg_ms": round(stats["total_seconds"] * 1000 / stats["count"], 2) if stats["count"] else 0.0,
+                    "max_ms": round(stats["max_seconds"] * 1000, 2),
+                }
+                for kind, stats in self._stats.items()
+            }
+
+hash_timings = HashTimings()
+
+def password_hash_profile() -> dict:
+    if PASSWORD_HASH_SCHEME == "argon2":
+        return {"scheme": "argon2", "time_cost": ARGON2_TIME_COST,
+                "memory_cost": ARGON2_MEMORY_COST, "parallelism": ARGON2_PARALLELISM}
+    return {"scheme": "bcrypt", "rounds": BCRYPT_ROUNDS}
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    start = time.perf_counter()
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    finally:
+        hash_timings.record("verify", time.perf_counter() - start)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    start = time.perf_counter()
+    try:
+        return pwd_context.hash(password)
+    finally:
+        hash_timings.record("hash", time.perf_counter() - start)
+
+def verify_and_update_password(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies the password and, if the stored hash uses an outdated scheme or
+    cost, returns a new hash made with the current profile (otherwise None).
+    """
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if not pwd_context.needs_update(hashed_password):
+        return True, None
+    start = time.perf_counter()
+    new_hash = pwd_context.hash(plain_password)
+    hash_timings.record("rehash", time.perf_counter() - start)
+    return True, new_hash
 
 # ------------------
 # JWT Configuration
@@ -56,7 +150,15 @@ def get_current_user_from_token(token: str = Depends(oauth2_scheme)):
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-        token_data = TokenData(username=username)
+        token_data = TokenData(username=username, role=payload.get("role"))
     except JWTError:
         raise credentials_exception
-    return token_data
\ No newline at end of file
+    return token_data
+
+def require_admin(current_user: TokenData = Depends(get_current_user_from_token)):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
\ No newline at end of file
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from typing import List
+from sqlalchemy.orm import Session, selectinload
 from . import models, schemas
 
 def get_drivers(db: Session, skip: int = 0, limit: int = 100):
@@ -7,6 +8,18 @@ def get_drivers(db: Session, skip: int = 0, limit: int = 100):
 def get_driver(db: Session, driver_id: int):
     return db.query(models.Driver).filter(models.Driver.id == driver_id).first()
 
+def get_drivers_by_ids(db: Session, driver_ids: List[int]):
+    # One IN query for the drivers plus one for all of their performances
+    if not driver_ids:
+        return []
+    return (
+        db.query(models.Driver)
+        .options(selectinload(models.Driver.performances))
+        .filter(models.Driver.id.in_(driver_ids))
+        .execution_options(hot_query="drivers_batch")
+        .all()
+    )
+
 def create_driver(db: Session, driver: schemas.DriverCreate):
     db_driver = models.Driver(**driver.model_dump())
     db.add(db_driver)
@@ -45,7 +58,14 @@ def add_performance_record(db: Session, perf: schemas.DriverPerformanceCreate, d
     return db_performance
 
 def get_performance_record(db: Session, performance_id: int):
-    return db.query(models.DriverPerformance).filter(models.DriverPerformance.id == performance_id).first()
+    # Archived records keep their id and are listed in the history, so they
+    # can be edited and deleted in place like hot ones.
+    db_performance = db.query(models.DriverPerformance).filter(models.DriverPerformance.id == performance_id).first()
+    if db_performance is None:
+        db_performance = db.query(models.DriverPerformanceArchive).filter(
+            models.DriverPerformanceArchive.id == performance_id
+        ).first()
+    return db_performance
 
 def update_performance_record(db: Session, performance_id: int, performance: schemas.DriverPerformanceCreate):
     db_performance = get_performance_record(db, performance_id=performance_id)
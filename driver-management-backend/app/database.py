@@ -6,6 +6,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Imported after load_dotenv() so its settings can come from .env
+from .slow_queries import slow_query_log
+
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
 if not SQLALCHEMY_DATABASE_URL:
@@ -19,6 +22,9 @@ engine = create_engine(
     echo=False
 )
 
+# Record slow statements and their EXPLAIN plans (see app/slow_queries.py)
+slow_query_log.install(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
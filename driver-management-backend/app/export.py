@@ -0,0 +1,143 @@
+# app/export.py
+"""
+Columnar export of performance history for analytics consumers.
+
+Performance records joined with their driver's attributes are read in
+fixed-size chunks, each converted to a typed Arrow record batch and written
+straight to the response as Parquet or as an Arrow IPC stream. Only one chunk
+is held in memory at a time, whatever the size of the tables.
+"""
+import os
+from datetime import date
+from typing import Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from . import models
+from .database import SessionLocal
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "10000"))
+
+PARQUET_COMPRESSIONS = ("zstd", "snappy", "gzip", "none")
+ARROW_COMPRESSIONS = ("zstd", "lz4", "none")
+
+EXPORT_SCHEMA = pa.schema([
+    ("performance_id", pa.int32()),
+    ("driver_id", pa.int32()),
+    ("date", pa.date32()),
+    ("rating", pa.int16()),
+    ("notes", pa.string()),
+    ("archived", pa.bool_()),
+    ("driver_name", pa.string()),
+    ("license_number", pa.string()),
+    ("status", pa.dictionary(pa.int32(), pa.string())),
+    ("car_model", pa.dictionary(pa.int32(), pa.string())),
+    ("hire_date", pa.date32()),
+])
+
+
+class _ChunkSink:
+    """Write-only file object that collects writer output so it can be streamed out in pieces."""
+
+    closed = False
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _iter_chunks(db, model, archived: bool, start_date: Optional[date], end_date: Optional[date],
+                 driver_ids: Optional[List[int]], chunk_size: int) -> Iterator[pa.RecordBatch]:
+    # Keyset pagination on the primary key: every chunk is a separate, index
+    # driven query, so memory stays bounded even with drivers that buffer
+    # whole result sets client side (mysql-connector does by default).
+    query = db.query(
+        model.id, model.driver_id, model.date, model.rating, model.notes,
+        models.Driver.name, models.Driver.license_number, models.Driver.status,
+        models.Driver.car_model, models.Driver.hire_date,
+    ).join(models.Driver, models.Driver.id == model.driver_id)
+    if start_date:
+        query = query.filter(model.date >= start_date)
+    if end_date:
+        query = query.filter(model.date <= end_date)
+    if driver_ids:
+        query = query.filter(model.driver_id.in_(driver_ids))
+
+    last_id = 0
+    while True:
+        rows = query.filter(model.id > last_id).order_by(model.id).limit(chunk_size).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays([
+            pa.array(columns[0], type=pa.int32()),
+            pa.array(columns[1], type=pa.int32()),
+            pa.array(columns[2], type=pa.date32()),
+            pa.array(columns[3], type=pa.int16()),
+            pa.array(columns[4], type=pa.string()),
+            pa.array([archived] * len(rows), type=pa.bool_()),
+            pa.array(columns[5], type=pa.string()),
+            pa.array(columns[6], type=pa.string()),
+            pa.array(columns[7], type=pa.string()).dictionary_encode(),
+            pa.array(columns[8], type=pa.string()).dictionary_encode(),
+            pa.array(columns[9], type=pa.date32()),
+        ], schema=EXPORT_SCHEMA)
+
+
+def iter_performance_batches(start_date: Optional[date] = None, end_date: Optional[date] = None,
+                             driver_ids: Optional[List[int]] = None, include_archived: bool = True,
+                             chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[pa.RecordBatch]:
+    """Yields the filtered performance history as record batches, archived records first."""
+    db = SessionLocal()
+    try:
+        if include_archived:
+            yield from _iter_chunks(db, models.DriverPerformanceArchive, True,
+                                    start_date, end_date, driver_ids, chunk_size)
+        yield from _iter_chunks(db, models.DriverPerformance, False,
+                                start_date, end_date, driver_ids, chunk_size)
+    finally:
+        db.close()
+
+
+def stream_parquet(batches: Iterator[pa.RecordBatch], compression: str = "zstd") -> Iterator[bytes]:
+    """Writes each batch as a Parquet row group and yields the bytes as they are produced."""
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, EXPORT_SCHEMA, compression=compression)
+    for batch in batches:
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_arrow(batches: Iterator[pa.RecordBatch], compression: str = "zstd") -> Iterator[bytes]:
+    """Writes the batches in the Arrow IPC streaming format, yielding the bytes as they are produced."""
+    sink = _ChunkSink()
+    options = pa.ipc.IpcWriteOptions(compression=None if compression == "none" else compression)
+    writer = pa.ipc.new_stream(sink, EXPORT_SCHEMA, options=options)
+    for batch in batches:
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
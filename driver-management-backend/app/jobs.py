@@ -0,0 +1,420 @@
+# app/jobs.py
+"""
+In-process background job runner.
+
+Jobs are stored in the `jobs` table and executed by a bounded thread pool that
+is started together with the application, so heavy work (exports, purges, ...)
+never runs inside a request handler and no external broker is needed.
+
+Handlers are registered with the `job_handler` decorator and receive a
+`JobContext` that gives them a database session, their parameters, progress
+reporting and a place to write output files.
+
+Several processes (uvicorn workers, app instances) may share the jobs table.
+A claimed job records the claiming process in `claimed_by`, which refreshes
+`heartbeat_at` while the job runs. Only running jobs whose heartbeat is older
+than JOB_HEARTBEAT_STALE_SECONDS are taken back and queued again.
+"""
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# ------------------
+# Configuration
+# ------------------
+JOB_OUTPUT_DIR = os.path.abspath(os.getenv("JOB_OUTPUT_DIR", "job_output"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "30"))
+JOB_DEFAULT_CONCURRENCY = int(os.getenv("JOB_DEFAULT_CONCURRENCY", "1"))
+# A running job whose heartbeat is older than this is assumed to belong to a
+# dead process. Must be well above JOB_POLL_INTERVAL and any clock skew
+# between hosts sharing the database.
+JOB_HEARTBEAT_STALE_SECONDS = float(os.getenv("JOB_HEARTBEAT_STALE_SECONDS", "60"))
+
+# Identifies this process in Job.claimed_by; the random part keeps it unique
+# when containers reuse the same hostname and pid.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _parse_concurrency(value: str) -> Dict[str, int]:
+    """Parses JOB_CONCURRENCY, e.g. "fleet_export=2,performance_purge=1"."""
+    limits = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        job_type, _, limit = item.partition("=")
+        limits[job_type.strip()] = max(1, int(limit))
+    return limits
+
+
+JOB_CONCURRENCY = _parse_concurrency(os.getenv("JOB_CONCURRENCY", ""))
+
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_SUCCEEDED = "succeeded"
+JOB_STATUS_FAILED = "failed"
+JOB_STATUS_CANCELLED = "cancelled"
+FINISHED_STATUSES = (JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED, JOB_STATUS_CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when cancellation of its job was requested."""
+
+
+class JobParamsError(ValueError):
+    """Raised by enqueue_job when the params do not suit the job type."""
+
+
+def _update_job(job_id: int, owner: Optional[str] = None, **fields) -> bool:
+    # Status updates use their own short session so they are committed
+    # independently of the work the handler is doing. With `owner`, the job
+    # is only updated while that process still holds it.
+    db = SessionLocal()
+    try:
+        query = db.query(models.Job).filter(models.Job.id == job_id)
+        if owner is not None:
+            query = query.filter(models.Job.claimed_by == owner)
+        updated = query.update(fields)
+        db.commit()
+        return bool(updated)
+    finally:
+        db.close()
+
+
+def _cancel_requested(job_id: int) -> bool:
+    # Read in a fresh session so a cancel committed meanwhile is always seen
+    db = SessionLocal()
+    try:
+        return bool(db.query(models.Job.cancel_requested).filter(models.Job.id == job_id).scalar())
+    finally:
+        db.close()
+
+
+# ------------------
+# Handler API
+# ------------------
+class JobContext:
+    def __init__(self, job_id: int, params: dict, db: Session):
+        self.job_id = job_id
+        self.params = params
+        self.db = db
+
+    def check_cancelled(self):
+        if _cancel_requested(self.job_id):
+            raise JobCancelled()
+
+    def report_progress(self, progress: int, message: Optional[str] = None):
+        """Stores progress (0-100) and raises JobCancelled if the job was cancelled."""
+        fields = {"progress": max(0, min(100, int(progress))), "heartbeat_at": datetime.now()}
+        if message is not None:
+            fields["message"] = message[:255]
+        if not _update_job(self.job_id, owner=WORKER_ID, **fields):
+            # Another process re-queued the job after our heartbeat went stale
+            raise JobCancelled()
+        self.check_cancelled()
+
+    def output_path(self, filename: str) -> str:
+        """Returns the path the job should write `filename` to and records it as the job result."""
+        job_dir = os.path.join(JOB_OUTPUT_DIR, str(self.job_id))
+        os.makedirs(job_dir, exist_ok=True)
+        _update_job(self.job_id, result_path=os.path.join(str(self.job_id), filename))
+        return os.path.join(job_dir, filename)
+
+
+_handlers: Dict[str, Callable[[JobContext], None]] = {}
+_param_validators: Dict[str, Callable[[dict], None]] = {}
+_admin_only_types = set()
+
+
+def job_handler(job_type: str, admin_only: bool = False,
+                validate_params: Optional[Callable[[dict], None]] = None):
+    """
+    Registers the decorated function as the handler for `job_type`.
+
+    `admin_only` job types can only be queued by admins through POST /jobs.
+    `validate_params` is called with the params when the job is queued and
+    should raise KeyError or ValueError if they are unusable.
+    """
+    def decorator(func: Callable[[JobContext], None]):
+        _handlers[job_type] = func
+        if validate_params:
+            _param_validators[job_type] = validate_params
+        if admin_only:
+            _admin_only_types.add(job_type)
+        return func
+    return decorator
+
+
+def is_admin_only(job_type: str) -> bool:
+    return job_type in _admin_only_types
+
+
+_schedules: Dict[str, tuple] = {}
+
+
+def schedule_periodic(job_type: str, interval_seconds: float, params: Optional[dict] = None):
+    """Queues `job_type` every `interval_seconds` unless one is already queued or running."""
+    _schedules[job_type] = (interval_seconds, params or {})
+
+
+def registered_job_types():
+    return sorted(_handlers)
+
+
+def concurrency_for(job_type: str) -> int:
+    return JOB_CONCURRENCY.get(job_type, JOB_DEFAULT_CONCURRENCY)
+
+
+def result_file_path(job: models.Job) -> Optional[str]:
+    if not job.result_path:
+        return None
+    return os.path.join(JOB_OUTPUT_DIR, job.result_path)
+
+
+# ------------------
+# Worker pool
+# ------------------
+class JobRunner:
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._running: Dict[str, int] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._requeue_stale_jobs()
+        max_workers = sum(concurrency_for(job_type) for job_type in _handlers) or 1
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="job-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._executor.shutdown(wait=wait)
+        self._thread = None
+        self._executor = None
+
+    def notify(self):
+        """Wakes the dispatcher so newly queued jobs start without waiting for the next poll."""
+        self._wake.set()
+
+    def _requeue_stale_jobs(self):
+        # Running jobs without a recent heartbeat belong to a process that
+        # died; run them again. Jobs of live processes are left alone.
+        stale_before = datetime.now() - timedelta(seconds=JOB_HEARTBEAT_STALE_SECONDS)
+        db = SessionLocal()
+        try:
+            db.query(models.Job).filter(
+                models.Job.status == JOB_STATUS_RUNNING,
+                or_(models.Job.heartbeat_at.is_(None), models.Job.heartbeat_at < stale_before),
+            ).update({"status": JOB_STATUS_QUEUED, "run_after": None, "claimed_by": None},
+                     synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _heartbeat(self):
+        with self._lock:
+            if not any(self._running.values()):
+                return
+        db = SessionLocal()
+        try:
+            db.query(models.Job).filter(
+                models.Job.claimed_by == WORKER_ID,
+                models.Job.status == JOB_STATUS_RUNNING,
+            ).update({"heartbeat_at": datetime.now()}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                # Our own heartbeat goes first so our jobs never look stale
+                self._heartbeat()
+                self._requeue_stale_jobs()
+                self._dispatch()
+            except Exception:
+                logger.exception("Job dispatch failed")
+            self._wake.wait(JOB_POLL_INTERVAL)
+
+    def _enqueue_due_periodic_jobs(self, db: Session):
+        now = datetime.now()
+        for job_type, (interval_seconds, params) in _schedules.items():
+            last_created = db.query(func.max(models.Job.created_at)).filter(
+                models.Job.job_type == job_type
+            ).scalar()
+            if last_created and last_created > now - timedelta(seconds=interval_seconds):
+                continue
+            pending = db.query(models.Job.id).filter(
+                models.Job.job_type == job_type,
+                models.Job.status.in_([JOB_STATUS_QUEUED, JOB_STATUS_RUNNING]),
+            ).first()
+            if pending:
+                continue
+            db.add(_new_job(job_type, params, max_attempts=3, created_by="scheduler"))
+            db.commit()
+
+    def _dispatch(self):
+        db = SessionLocal()
+        try:
+            self._enqueue_due_periodic_jobs(db)
+            for job_type in _handlers:
+                with self._lock:
+                    free_slots = concurrency_for(job_type) - self._running.get(job_type, 0)
+                if free_slots <= 0:
+                    continue
+                now = datetime.now()
+                candidates = db.query(models.Job.id).filter(
+                    models.Job.job_type == job_type,
+                    models.Job.status == JOB_STATUS_QUEUED,
+                    or_(models.Job.run_after.is_(None), models.Job.run_after <= now),
+                ).order_by(models.Job.id).limit(free_slots).all()
+
+                for (job_id,) in candidates:
+                    # Conditional update so that only one runner can claim a job.
+                    claimed = db.query(models.Job).filter(
+                        models.Job.id == job_id,
+                        models.Job.status == JOB_STATUS_QUEUED,
+                    ).update({
+                        "status": JOB_STATUS_RUNNING,
+                        "attempts": models.Job.attempts + 1,
+                        "started_at": now,
+                        "error": None,
+                        "claimed_by": WORKER_ID,
+                        "heartbeat_at": now,
+                    }, synchronize_session=False)
+                    db.commit()
+                    if not claimed:
+                        continue
+                    with self._lock:
+                        self._running[job_type] = self._running.get(job_type, 0) + 1
+                    self._executor.submit(self._run, job_id, job_type)
+        finally:
+            db.close()
+
+    def _run(self, job_id: int, job_type: str):
+        db = SessionLocal()
+        try:
+            job = db.get(models.Job, job_id)
+            attempts, max_attempts = job.attempts, job.max_attempts
+            context = JobContext(job_id, job.params or {}, db)
+            try:
+                _handlers[job_type](context)
+            except JobCancelled:
+                db.rollback()
+                _update_job(job_id, owner=WORKER_ID, status=JOB_STATUS_CANCELLED, finished_at=datetime.now())
+            except Exception as exc:
+                db.rollback()
+                logger.exception("Job %s (%s) failed on attempt %s", job_id, job_type, attempts)
+                # Bad params fail the same way every time, so they are not retried
+                retryable = not isinstance(exc, (KeyError, ValueError))
+                if _cancel_requested(job_id):
+                    _update_job(job_id, owner=WORKER_ID, status=JOB_STATUS_CANCELLED,
+                                finished_at=datetime.now(), error=repr(exc))
+                elif retryable and attempts < max_attempts:
+                    delay = JOB_RETRY_BACKOFF_SECONDS * (2 ** (attempts - 1))
+                    _update_job(
+                        job_id,
+                        owner=WORKER_ID,
+                        status=JOB_STATUS_QUEUED,
+                        run_after=datetime.now() + timedelta(seconds=delay),
+                        error=repr(exc),
+                    )
+                else:
+                    _update_job(job_id, owner=WORKER_ID, status=JOB_STATUS_FAILED,
+                                finished_at=datetime.now(), error=repr(exc))
+            else:
+                _update_job(job_id, owner=WORKER_ID, status=JOB_STATUS_SUCCEEDED, progress=100,
+                            finished_at=datetime.now())
+        except Exception:
+            logger.exception("Could not record the outcome of job %s", job_id)
+        finally:
+            db.close()
+            with self._lock:
+                self._running[job_type] -= 1
+            self._wake.set()
+
+
+runner = JobRunner()
+
+
+# ------------------
+# Job API used by the routes
+# ------------------
+def _new_job(job_type: str, params: Optional[dict], max_attempts: int,
+             created_by: Optional[str]) -> models.Job:
+    return models.Job(
+        job_type=job_type,
+        params=params or {},
+        max_attempts=max_attempts,
+        created_by=created_by,
+        status=JOB_STATUS_QUEUED,
+        progress=0,
+        attempts=0,
+        cancel_requested=False,
+        # Set here rather than by the database so it compares with the
+        # other job timestamps, which are all taken from the app clock.
+        created_at=datetime.now(),
+    )
+
+
+def enqueue_job(db: Session, job_type: str, params: Optional[dict] = None,
+                max_attempts: int = 3, created_by: Optional[str] = None) -> models.Job:
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type '{job_type}'")
+    if job_type in _param_validators:
+        try:
+            _param_validators[job_type](params or {})
+        except (KeyError, TypeError, ValueError) as e:
+            raise JobParamsError(f"Invalid params for job type '{job_type}': {e!r}")
+    job = _new_job(job_type, params, max_attempts, created_by)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    runner.notify()
+    return job
+
+
+def get_job(db: Session, job_id: int) -> Optional[models.Job]:
+    return db.query(models.Job).filter(models.Job.id == job_id).first()
+
+
+def cancel_job(db: Session, job: models.Job) -> models.Job:
+    """Cancels a queued job immediately; a running job stops at its next progress report."""
+    db.query(models.Job).filter(
+        models.Job.id == job.id,
+        models.Job.status == JOB_STATUS_QUEUED,
+    ).update({
+        "status": JOB_STATUS_CANCELLED,
+        "finished_at": datetime.now(),
+    }, synchronize_session=False)
+    db.query(models.Job).filter(models.Job.id == job.id).update(
+        {"cancel_requested": True}, synchronize_session=False
+    )
+    db.commit()
+    db.refresh(job)
+    return job
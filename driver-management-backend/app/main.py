@@ -1,5 +1,6 @@
 # app/main.py
 
+import os
 from typing import List, Optional
 from fastapi import Depends, HTTPException, status, Response, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,10 +8,17 @@ from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import asc, desc
 from datetime import date
-from . import models, schemas, auth, crud
+from . import models, schemas, auth, crud, jobs, archive, slow_queries
+from . import tasks  # noqa: F401  registers the built-in job types
 from .database import engine, get_db
 from routers import auth_routes as auth_router
+from routers import job_routes as job_router
+from routers import archive_routes as archive_router
+from routers import export_routes as export_router
+from routers import slow_query_routes as slow_query_router
 
+# Maximum number of drivers resolved by one /drivers/batch request
+DRIVER_BATCH_MAX = int(os.getenv("DRIVER_BATCH_MAX", "200"))
 
 app = FastAPI()
 
@@ -22,12 +30,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def track_route_for_slow_queries(request, call_next):
+    # Lets the slow-query log attribute statements to the request that ran them
+    token = slow_queries.current_route.set(f"{request.method} {request.url.path}")
+    try:
+        return await call_next(request)
+    finally:
+        slow_queries.current_route.reset(token)
+
 @app.on_event("startup")
 def startup_event():
     models.Base.metadata.create_all(bind=engine)
+    # Start the background job workers (see app/jobs.py)
+    jobs.runner.start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    jobs.runner.stop()
 
 # Include the authentication router. The endpoints are now at /auth/login and /auth/register
 app.include_router(auth_router.router, prefix="/auth", tags=["auth"])
+# Background jobs: POST /jobs, GET /jobs/{id}, cancel and result download
+app.include_router(job_router.router, prefix="/jobs", tags=["jobs"])
+# Admin-only archival of old performance records
+app.include_router(archive_router.router, prefix="/admin/archive", tags=["archive"])
+# Columnar (Parquet / Arrow) exports for analytics
+app.include_router(export_router.router, prefix="/export", tags=["export"])
+# Admin-only view of the slow-query log
+app.include_router(slow_query_router.router, prefix="/admin/slow-queries", tags=["admin"])
 
 # Driver Endpoints
 @app.post("/drivers/", response_model=schemas.Driver, status_code=status.HTTP_201_CREATED)
@@ -73,20 +104,61 @@ def get_drivers(
     if status:
         query = query.filter(models.Driver.status == status)
     if sort_by:
-        sort_column = getattr(models.Driver, sort_by, None)
-        if sort_column:
+        # Only real table columns; anything else (relationships, methods) is ignored
+        sort_column = models.Driver.__table__.columns.get(sort_by)
+        if sort_column is not None:
             query = query.order_by(sort_column)
 
     drivers = query.all()
     return drivers
 
+def _get_drivers_batch(db: Session, ids: List[int]):
+    # Drop duplicates but keep the order the client asked for
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > DRIVER_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {DRIVER_BATCH_MAX} driver ids can be requested at once."
+        )
+    drivers_by_id = {driver.id: driver for driver in crud.get_drivers_by_ids(db, ids)}
+    return {
+        "drivers": [drivers_by_id[driver_id] for driver_id in ids if driver_id in drivers_by_id],
+        "missing_ids": [driver_id for driver_id in ids if driver_id not in drivers_by_id],
+    }
+
+# Declared before /drivers/{driver_id} so "batch" is not taken for a driver id
+@app.get("/drivers/batch", response_model=schemas.DriverBatch)
+def get_drivers_batch(
+    ids: str,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(auth.get_current_user_from_token)
+):
+    """Fetches several drivers by comma-separated ids, e.g. /drivers/batch?ids=3,1,7"""
+    try:
+        driver_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be a comma-separated list of integers."
+        )
+    return _get_drivers_batch(db, driver_ids)
+
+@app.post("/drivers/batch", response_model=schemas.DriverBatch)
+def post_drivers_batch(
+    batch: schemas.DriverBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(auth.get_current_user_from_token)
+):
+    """Same as GET /drivers/batch, for id lists too long for a query string."""
+    return _get_drivers_batch(db, batch.ids)
+
 @app.get("/drivers/{driver_id}", response_model=schemas.Driver)
 def get_driver_by_id(
     driver_id: int, 
     db: Session = Depends(get_db), 
     current_user: schemas.User = Depends(auth.get_current_user_from_token)
 ):
-    driver = db.query(models.Driver).options(joinedload(models.Driver.performances)).filter(models.Driver.id == driver_id).first()
+    driver = db.query(models.Driver).options(joinedload(models.Driver.performances)).filter(models.Driver.id == driver_id).execution_options(hot_query="driver_by_id").first()
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found")
     return driver
@@ -127,6 +199,7 @@ def delete_driver(
     if db_driver is None:
         raise HTTPException(status_code=404, detail="Driver not found")
     db.query(models.DriverPerformance).filter(models.DriverPerformance.driver_id == driver_id).delete()
+    db.query(models.DriverPerformanceArchive).filter(models.DriverPerformanceArchive.driver_id == driver_id).delete()
     db.delete(db_driver)
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -144,13 +217,16 @@ def add_driver_performance(
 @app.get("/drivers/{driver_id}/history/", response_model=List[schemas.DriverPerformance])
 def get_driver_history(
     driver_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(auth.get_current_user_from_token)
 ):
     driver = db.query(models.Driver).filter(models.Driver.id == driver_id).first()
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found")
-    return driver.performances
+    # Spans the hot and archive tables when the range reaches into archived dates
+    return archive.get_performance_history(db, driver_id, start_date=start_date, end_date=end_date)
 
 @app.put("/performances/{performance_id}", response_model=schemas.DriverPerformance)
 def update_performance_record(
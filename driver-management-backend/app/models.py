@@ -1,5 +1,5 @@
 # app/models.py
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, Boolean, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -45,8 +45,8 @@ class DriverPerformance(Base):
     __tablename__ = "driver_performances"
 
     id = Column(Integer, primary_key=True, index=True)
-    driver_id = Column(Integer, ForeignKey("drivers.id"))
-    date = Column(Date)
+    driver_id = Column(Integer, ForeignKey("drivers.id"), index=True)
+    date = Column(Date, index=True)
     rating = Column(Integer)  
     notes = Column(String(255))
 
@@ -54,4 +54,58 @@ class DriverPerformance(Base):
     driver = relationship("Driver", back_populates="performances")
 
     def __repr__(self):
-        return f"<DriverPerformance(id={self.id}, driver_id={self.driver_id}, rating={self.rating})>"
\ No newline at end of file
+        return f"<DriverPerformance(id={self.id}, driver_id={self.driver_id}, rating={self.rating})>"
+
+# Cold storage for old performance records (see app/archive.py).
+# Rows keep the id they had in driver_performances so they can be restored.
+class DriverPerformanceArchive(Base):
+    __tablename__ = "driver_performances_archive"
+    __table_args__ = (
+        Index("ix_driver_performances_archive_driver_date", "driver_id", "date"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    driver_id = Column(Integer, ForeignKey("drivers.id"))
+    date = Column(Date, index=True)
+    rating = Column(Integer)
+    notes = Column(String(255))
+    archived_at = Column(DateTime, default=func.now())
+
+    # Exposed through schemas.DriverPerformance so clients can tell archived records apart
+    archived = True
+
+    def __repr__(self):
+        return f"<DriverPerformanceArchive(id={self.id}, driver_id={self.driver_id}, rating={self.rating})>"
+
+# Job model (background job runner, see app/jobs.py)
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(100), index=True)
+    # One of 'queued', 'running', 'succeeded', 'failed', 'cancelled'
+    status = Column(String(20), default="queued", index=True)
+    params = Column(JSON)
+    progress = Column(Integer, default=0)
+    message = Column(String(255))
+
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    cancel_requested = Column(Boolean, default=False)
+    error = Column(Text)
+
+    # Path of the file written by the job, relative to JOB_OUTPUT_DIR
+    result_path = Column(String(255))
+
+    created_by = Column(String(50))
+    created_at = Column(DateTime, default=func.now())
+    # Process running the job and when it last reported being alive
+    claimed_by = Column(String(100))
+    heartbeat_at = Column(DateTime)
+    # Earliest time the job may be picked up (set when a retry is backed off)
+    run_after = Column(DateTime)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, job_type='{self.job_type}', status='{self.status}')>"
\ No newline at end of file
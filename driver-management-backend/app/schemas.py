@@ -1,6 +1,6 @@
 # app/schemas.py
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import date, datetime
 from pydantic import BaseModel, Field
 
@@ -31,6 +31,19 @@ class UserCreate(BaseModel):
     password: str
     role: Optional[str] = 'client' 
 
+class HashTiming(BaseModel):
+    count: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+
+class HashStats(BaseModel):
+    profile: Dict[str, Any]
+    verify: HashTiming
+    hash: HashTiming
+    # Hashes upgraded to the current profile on login
+    rehash: HashTiming
+
 
 # --- Driver Schemas ---
 
@@ -42,6 +55,8 @@ class DriverPerformanceCreate(BaseModel):
 class DriverPerformance(DriverPerformanceCreate):
     id: int
     driver_id: int
+    # True for records served from the archive table
+    archived: bool = False
     class Config:
         from_attributes = True 
 
@@ -75,7 +90,87 @@ class Driver(DriverBase):
     updated_at: datetime
     
     # Include the list of performances, crucial for ClientDriversView
+    # Only records still in the hot table; archived ones (older than
+    # ARCHIVE_AFTER_DAYS) are returned by GET /drivers/{id}/history/
     performances: List[DriverPerformance] = []
 
+    class Config:
+        from_attributes = True
+
+
+class DriverBatchRequest(BaseModel):
+    ids: List[int]
+
+class DriverBatch(BaseModel):
+    # Found drivers, in the order their ids were requested
+    drivers: List[Driver]
+    missing_ids: List[int]
+
+
+# --- Archive Schemas ---
+
+class ArchiveRun(BaseModel):
+    # Defaults to today minus ARCHIVE_AFTER_DAYS
+    cutoff: Optional[date] = None
+
+class ArchiveRestore(BaseModel):
+    driver_id: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+class ArchiveStats(BaseModel):
+    hot_rows: int
+    archived_rows: int
+    oldest_hot_date: Optional[date] = None
+    archive_watermark: Optional[date] = None
+    cutoff: date
+
+
+# --- Slow Query Log Schemas ---
+
+class SlowQuery(BaseModel):
+    normalized_sql: str
+    param_shape: Optional[Any] = None
+    route: Optional[str] = None
+    hot_query: Optional[str] = None
+    duration_ms: float
+    occurred_at: datetime
+    explain: Optional[List[Dict[str, Any]]] = None
+    full_table_scan: Optional[bool] = None
+
+class SlowQueryLog(BaseModel):
+    threshold_ms: float
+    strict: bool
+    # Newest first
+    queries: List[SlowQuery]
+
+
+# --- Background Job Schemas ---
+
+class JobCreate(BaseModel):
+    job_type: str
+    params: Dict[str, Any] = {}
+    max_attempts: int = Field(3, ge=1, le=10)
+
+class Job(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    params: Optional[Dict[str, Any]] = None
+    progress: int
+    message: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    error: Optional[str] = None
+    result_path: Optional[str] = None
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    run_after: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    claimed_by: Optional[str] = None
+    heartbeat_at: Optional[datetime] = None
+
     class Config:
         from_attributes = True
\ No newline at end of file
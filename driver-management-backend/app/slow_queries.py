@@ -0,0 +1,196 @@
+# app/slow_queries.py
+"""
+Slow-query log built on SQLAlchemy engine events.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are recorded in a bounded ring
+buffer with their normalized SQL, the shape of their bind parameters and the
+route that issued them. The backend's EXPLAIN output is captured once per
+distinct statement shape. The log is served on GET /admin/slow-queries.
+
+Queries on hot paths are tagged with `.execution_options(hot_query="name")`.
+In strict mode (SLOW_QUERY_STRICT=1, or `slow_query_log.strict = True`) every
+tagged query is EXPLAINed and raises FullTableScanError if the plan scans a
+whole table; check_hot_queries.py uses this to guard the hot paths.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# ------------------
+# Configuration
+# ------------------
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+SLOW_QUERY_STRICT = os.getenv("SLOW_QUERY_STRICT", "").lower() in ("1", "true", "yes")
+
+# Set per request by the middleware in app/main.py
+current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+
+class FullTableScanError(Exception):
+    """Raised in strict mode when a query tagged as hot does a full table scan."""
+
+
+# ------------------
+# Statement normalization
+# ------------------
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|\?|(?<![:\w]):\w+")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Replaces literals and bind markers with '?' so statements of the same shape compare equal."""
+    sql = _STRING_LITERAL_RE.sub("?", statement)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(?, ...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def param_shape(parameters):
+    """Describes bind parameters by type only, never by value."""
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: the shape of one row plus the row count
+            return {"rows": len(parameters), "row": param_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def detect_full_scan(dialect_name: str, plan: List[dict]) -> bool:
+    """Returns True if an EXPLAIN plan contains a full scan of a real table."""
+    # Scans of derived tables (subqueries already narrowed down) are not table scans
+    if dialect_name == "sqlite":
+        derived = {
+            row["detail"].split(" ", 1)[1]
+            for row in plan
+            if str(row.get("detail", "")).startswith(("CO-ROUTINE ", "MATERIALIZE "))
+        }
+    for row in plan:
+        if dialect_name == "mysql" and str(row.get("type", "")).upper() == "ALL":
+            if not str(row.get("table", "")).startswith("<"):
+                return True
+        if dialect_name == "sqlite":
+            detail = str(row.get("detail", ""))
+            if detail.startswith("SCAN ") and "USING" not in detail and detail.split(" ")[1] not in derived:
+                return True
+        if dialect_name == "postgresql" and "Seq Scan" in str(row.get("QUERY PLAN", "")):
+            return True
+    return False
+
+
+# ------------------
+# Ring buffer
+# ------------------
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float, max_entries: int, strict: bool = False):
+        self.threshold_ms = threshold_ms
+        self.strict = strict
+        self._entries = deque(maxlen=max_entries)
+        # normalized SQL -> (plan rows, full table scan?); oldest shapes are evicted first
+        self._plans: "OrderedDict[str, tuple]" = OrderedDict()
+        self._max_plans = max_entries
+        self._lock = threading.Lock()
+
+    def install(self, engine: Engine):
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def entries(self) -> List[dict]:
+        with self._lock:
+            entries = list(self._entries)
+            plans = dict(self._plans)
+        result = []
+        for entry in reversed(entries):
+            plan, full_scan = plans.get(entry["normalized_sql"], (None, None))
+            result.append(dict(entry, explain=plan, full_table_scan=full_scan))
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_slow_query_start", None)
+        if start is None:
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        hot_query = context.execution_options.get("hot_query")
+        is_slow = elapsed_ms >= self.threshold_ms
+        check_hot = self.strict and hot_query is not None
+        if not (is_slow or check_hot):
+            return
+
+        normalized = normalize_sql(statement)
+        plan, full_scan = None, None
+        if statement.lstrip().upper().startswith("SELECT"):
+            plan, full_scan = self._get_plan(conn, normalized, statement, parameters)
+
+        if is_slow:
+            with self._lock:
+                self._entries.append({
+                    "normalized_sql": normalized,
+                    "param_shape": param_shape(parameters),
+                    "route": current_route.get(),
+                    "hot_query": hot_query,
+                    "duration_ms": round(elapsed_ms, 2),
+                    "occurred_at": datetime.now(),
+                })
+        if check_hot and full_scan:
+            raise FullTableScanError(f"Hot query '{hot_query}' does a full table scan: {normalized}")
+
+    def _get_plan(self, conn, normalized: str, statement: str, parameters):
+        with self._lock:
+            if normalized in self._plans:
+                return self._plans[normalized]
+        plan = self._explain(conn, statement, parameters)
+        full_scan = detect_full_scan(conn.dialect.name, plan) if plan is not None else None
+        with self._lock:
+            self._plans[normalized] = (plan, full_scan)
+            while len(self._plans) > self._max_plans:
+                self._plans.popitem(last=False)
+        return plan, full_scan
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[List[dict]]:
+        # A raw DBAPI cursor on the same connection: it sees the same session
+        # state and does not fire engine events, so it is never logged itself.
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                columns = [column[0] for column in cursor.description]
+                return [
+                    {name: (value if isinstance(value, (int, float, type(None))) else str(value))
+                     for name, value in zip(columns, row)}
+                    for row in cursor.fetchall()
+                ]
+            finally:
+                cursor.close()
+        except Exception:
+            logger.warning("Could not EXPLAIN statement: %s", statement, exc_info=True)
+            return None
+
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_STRICT)
@@ -0,0 +1,100 @@
+# app/tasks.py
+"""
+Built-in background job types. See app/jobs.py for the runner.
+"""
+import csv
+from datetime import date
+
+from sqlalchemy import literal, select, union_all
+
+from . import models
+from .archive import _filter_records
+from .jobs import JobContext, job_handler
+
+JOB_BATCH_SIZE = 1000
+
+
+def _validate_fleet_export_params(params: dict):
+    if params.get("status") is not None and not isinstance(params["status"], str):
+        raise ValueError("'status' must be a string")
+    if not isinstance(params.get("include_archived", True), bool):
+        raise ValueError("'include_archived' must be a boolean")
+
+
+def _validate_purge_params(params: dict):
+    if not params.get("before"):
+        raise KeyError("before")
+    date.fromisoformat(params["before"])
+    if params.get("driver_id") is not None:
+        int(params["driver_id"])
+
+
+@job_handler("fleet_export", validate_params=_validate_fleet_export_params)
+def fleet_export(ctx: JobContext):
+    """
+    Writes every driver together with their performance records to a CSV file.
+    Optional params: `status` to export only drivers with that status and
+    `include_archived` (default true) to include archived records.
+    """
+    columns = ("driver_id", "date", "rating", "notes")
+    performances = select(*(getattr(models.DriverPerformance, name) for name in columns),
+                          literal(False).label("archived"))
+    if ctx.params.get("include_archived", True):
+        performances = union_all(
+            performances,
+            select(*(getattr(models.DriverPerformanceArchive, name) for name in columns),
+                   literal(True).label("archived")),
+        )
+    perf = performances.subquery()
+    query = ctx.db.query(models.Driver, perf.c.date, perf.c.rating, perf.c.notes, perf.c.archived).outerjoin(
+        perf, perf.c.driver_id == models.Driver.id
+    )
+    if ctx.params.get("status"):
+        query = query.filter(models.Driver.status == ctx.params["status"])
+
+    total = query.count() or 1
+    path = ctx.output_path("fleet_export.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "driver_id", "name", "license_number", "phone_number", "car_model",
+            "hire_date", "status", "performance_date", "rating", "notes", "archived",
+        ])
+        query = query.order_by(models.Driver.id, perf.c.date)
+        for written, (driver, perf_date, rating, notes, archived) in enumerate(query.yield_per(JOB_BATCH_SIZE),
+                                                                               start=1):
+            writer.writerow([
+                driver.id, driver.name, driver.license_number, driver.phone_number,
+                driver.car_model, driver.hire_date, driver.status,
+                perf_date, rating, notes,
+                bool(archived) if perf_date is not None else None,
+            ])
+            if written % JOB_BATCH_SIZE == 0:
+                ctx.report_progress(written * 100 // total, f"{written} of {total} rows written")
+
+
+@job_handler("performance_purge", admin_only=True, validate_params=_validate_purge_params)
+def performance_purge(ctx: JobContext):
+    """
+    Deletes performance records dated before `params['before']` (ISO date),
+    optionally only for `params['driver_id']`, in batches. Archived records
+    are deleted as well.
+    """
+    before = date.fromisoformat(ctx.params["before"])
+    driver_id = int(ctx.params["driver_id"]) if ctx.params.get("driver_id") is not None else None
+    queries = [
+        (model, _filter_records(ctx.db.query(model.id), model, driver_id).filter(model.date < before))
+        for model in (models.DriverPerformance, models.DriverPerformanceArchive)
+    ]
+
+    total = sum(query.count() for _, query in queries) or 1
+    deleted = 0
+    for model, query in queries:
+        while True:
+            ids = [row.id for row in query.order_by(model.id).limit(JOB_BATCH_SIZE)]
+            if not ids:
+                break
+            ctx.db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+            ctx.db.commit()
+            deleted += len(ids)
+            ctx.report_progress(deleted * 100 // total, f"{deleted} records deleted")
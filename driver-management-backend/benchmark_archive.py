@@ -0,0 +1,79 @@
+"""
+Measures the hot performance table size and the p95 latency of
+GET /drivers/{id}/history/ before and after archiving old records.
+
+Usage:
+    python benchmark_archive.py [--cutoff YYYY-MM-DD] [--requests 200] [--measure-only]
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+
+from app import archive, auth, models, schemas
+from app.database import SessionLocal
+from app.main import app
+
+
+def p95(samples):
+    return statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+
+
+def measure(client, driver_ids, requests):
+    recent_start = (date.today() - timedelta(days=archive.ARCHIVE_AFTER_DAYS)).isoformat()
+    full, recent = [], []
+    for _ in range(requests):
+        driver_id = random.choice(driver_ids)
+        start = time.perf_counter()
+        client.get(f"/drivers/{driver_id}/history/")
+        full.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        client.get(f"/drivers/{driver_id}/history/", params={"start_date": recent_start})
+        recent.append((time.perf_counter() - start) * 1000)
+    return p95(full), p95(recent)
+
+
+def report(label, stats, full_p95, recent_p95):
+    print(f"{label}:")
+    print(f"  hot rows:      {stats['hot_rows']}")
+    print(f"  archived rows: {stats['archived_rows']}")
+    print(f"  p95 history (full range):   {full_p95:.1f} ms")
+    print(f"  p95 history (recent range): {recent_p95:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cutoff", type=date.fromisoformat, default=None)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--measure-only", action="store_true", help="Do not archive, only measure")
+    args = parser.parse_args()
+
+    app.dependency_overrides[auth.get_current_user_from_token] = lambda: schemas.TokenData(
+        username="benchmark", role="admin"
+    )
+    db = SessionLocal()
+    try:
+        driver_ids = [row.id for row in db.query(models.Driver.id)]
+        if not driver_ids:
+            print("No drivers in the database, nothing to measure.")
+            return
+        client = TestClient(app)
+
+        report("Before", archive.table_stats(db), *measure(client, driver_ids, args.requests))
+        if args.measure_only:
+            return
+
+        start = time.perf_counter()
+        moved = archive.archive_performances(db, args.cutoff)
+        print(f"\nArchived {moved} records in {time.perf_counter() - start:.1f} s\n")
+
+        report("After", archive.table_stats(db), *measure(client, driver_ids, args.requests))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compares fetching drivers one by one through GET /drivers/{id} with a single
+GET /drivers/batch call for the same ids. Requests go through the full app,
+including token validation, against the database configured in .env.
+
+Usage:
+    python benchmark_driver_batch.py [--count 100] [--rounds 5]
+"""
+import argparse
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+
+from app import auth, models
+from app.database import SessionLocal
+from app.main import app
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100, help="Number of drivers to fetch")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        driver_ids = [row.id for row in db.query(models.Driver.id).limit(args.count)]
+    finally:
+        db.close()
+    if not driver_ids:
+        print("No drivers in the database, nothing to measure.")
+        return
+
+    token = auth.create_access_token({"sub": "benchmark", "role": "admin"})
+    client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+    ids_param = ",".join(str(driver_id) for driver_id in driver_ids)
+
+    def individual():
+        for driver_id in driver_ids:
+            client.get(f"/drivers/{driver_id}").raise_for_status()
+
+    def batch():
+        client.get("/drivers/batch", params={"ids": ids_param}).raise_for_status()
+
+    individual_ms = [timed(individual) for _ in range(args.rounds)]
+    batch_ms = [timed(batch) for _ in range(args.rounds)]
+
+    print(f"{len(driver_ids)} drivers, median of {args.rounds} rounds:")
+    print(f"  individual calls: {statistics.median(individual_ms):.1f} ms")
+    print(f"  one batch call:   {statistics.median(batch_ms):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares exporting the whole performance history as JSON (scraping
+GET /drivers/{id}/history/ driver by driver, as analytics does today) with
+the Parquet and Arrow IPC exports, reporting time and transferred size.
+
+Usage:
+    python benchmark_export.py [--compression zstd]
+"""
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from app import auth, models
+from app.database import SessionLocal
+from app.main import app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--compression", default="zstd")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        driver_ids = [row.id for row in db.query(models.Driver.id)]
+    finally:
+        db.close()
+
+    token = auth.create_access_token({"sub": "benchmark", "role": "admin"})
+    client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+    results = []
+
+    start = time.perf_counter()
+    json_bytes = 0
+    for driver_id in driver_ids:
+        response = client.get(f"/drivers/{driver_id}/history/")
+        response.raise_for_status()
+        json_bytes += len(response.content)
+    results.append(("JSON (per driver)", time.perf_counter() - start, json_bytes))
+
+    for label, path in (("Parquet", "/export/performances.parquet"), ("Arrow IPC", "/export/performances.arrows")):
+        start = time.perf_counter()
+        response = client.get(path, params={"compression": args.compression})
+        response.raise_for_status()
+        results.append((label, time.perf_counter() - start, len(response.content)))
+
+    print(f"{len(driver_ids)} drivers, columnar compression: {args.compression}")
+    for label, seconds, size in results:
+        print(f"  {label:<18} {seconds * 1000:10.1f} ms {size / 1024:12.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
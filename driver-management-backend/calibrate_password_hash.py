@@ -0,0 +1,78 @@
+"""
+Benchmarks password hashing on this host and prints the .env settings that
+bring one password verification as close as possible to the target time
+without exceeding it.
+
+Usage:
+    python calibrate_password_hash.py [--target-ms 250] [--scheme bcrypt|argon2]
+"""
+import argparse
+import statistics
+import time
+
+from app.auth import build_crypt_context
+
+SAMPLES = 5
+# Never recommend fewer bcrypt rounds than this, even on slow hosts
+MIN_BCRYPT_ROUNDS = 10
+SAMPLE_PASSWORD = "calibration-password"
+
+
+def median_verify_ms(context) -> float:
+    hashed = context.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(SAMPLES):
+        start = time.perf_counter()
+        context.verify(SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target_ms: float) -> dict:
+    # Each extra round doubles the cost, so stop at the first one over target
+    best = {"BCRYPT_ROUNDS": MIN_BCRYPT_ROUNDS}
+    for rounds in range(MIN_BCRYPT_ROUNDS, 20):
+        elapsed = median_verify_ms(build_crypt_context("bcrypt", bcrypt_rounds=rounds))
+        print(f"  bcrypt rounds={rounds}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = {"BCRYPT_ROUNDS": rounds}
+    return best
+
+
+def calibrate_argon2(target_ms: float, memory_cost: int, parallelism: int) -> dict:
+    # Keep the memory cost fixed and raise the number of passes
+    best = {"ARGON2_TIME_COST": 1, "ARGON2_MEMORY_COST": memory_cost, "ARGON2_PARALLELISM": parallelism}
+    for time_cost in range(1, 20):
+        context = build_crypt_context("argon2", argon2_time_cost=time_cost, argon2_memory_cost=memory_cost,
+                                      argon2_parallelism=parallelism)
+        elapsed = median_verify_ms(context)
+        print(f"  argon2 time_cost={time_cost} memory_cost={memory_cost} KiB: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best["ARGON2_TIME_COST"] = time_cost
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250, help="Target time for one verification")
+    parser.add_argument("--scheme", choices=("bcrypt", "argon2"), default="bcrypt")
+    parser.add_argument("--argon2-memory-cost", type=int, default=65536, help="KiB")
+    parser.add_argument("--argon2-parallelism", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"Calibrating {args.scheme} for a {args.target_ms:.0f} ms verify time...")
+    if args.scheme == "bcrypt":
+        settings = calibrate_bcrypt(args.target_ms)
+    else:
+        settings = calibrate_argon2(args.target_ms, args.argon2_memory_cost, args.argon2_parallelism)
+
+    print("\nAdd to .env:")
+    print(f"PASSWORD_HASH_SCHEME={args.scheme}")
+    for name, value in settings.items():
+        print(f"{name}={value}")
+
+
+if __name__ == "__main__":
+    main()
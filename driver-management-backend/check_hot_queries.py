@@ -0,0 +1,50 @@
+"""
+Fails if a query tagged as hot (`execution_options(hot_query=...)`) does a
+full table scan. Runs the hot endpoints with the slow-query log in strict
+mode against the database configured in .env and exits non-zero on the
+first FullTableScanError.
+
+Usage:
+    python check_hot_queries.py
+"""
+import sys
+
+from fastapi.testclient import TestClient
+
+from app import auth, models
+from app.database import SessionLocal
+from app.main import app
+from app.slow_queries import FullTableScanError, slow_query_log
+
+
+def main():
+    db = SessionLocal()
+    try:
+        driver_ids = [row.id for row in db.query(models.Driver.id).limit(10)]
+    finally:
+        db.close()
+    if not driver_ids:
+        print("No drivers in the database; add some data so the hot queries have plans to check.")
+        return 1
+
+    slow_query_log.strict = True
+    token = auth.create_access_token({"sub": "check-hot-queries", "role": "admin"})
+    client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+    paths = [
+        f"/drivers/{driver_ids[0]}",
+        f"/drivers/{driver_ids[0]}/history/",
+        f"/drivers/{driver_ids[0]}/history/?start_date=1900-01-01",
+        "/drivers/batch?ids=" + ",".join(str(driver_id) for driver_id in driver_ids),
+    ]
+    for path in paths:
+        try:
+            client.get(path).raise_for_status()
+        except FullTableScanError as e:
+            print(f"FAIL {path}: {e}")
+            return 1
+        print(f"ok   {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
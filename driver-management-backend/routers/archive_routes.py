@@ -0,0 +1,44 @@
+# routers/archive_routes.py
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from app import archive, jobs, schemas
+from app.auth import require_admin
+from app.database import get_db
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=schemas.ArchiveStats)
+def get_archive_stats(
+    db: Session = Depends(get_db),
+    current_user: schemas.TokenData = Depends(require_admin)
+):
+    """Row counts of the hot and archive tables, useful before and after an archive run."""
+    return archive.table_stats(db)
+
+
+@router.post("/run", response_model=schemas.Job, status_code=status.HTTP_202_ACCEPTED)
+def run_archive(
+    archive_run: schemas.ArchiveRun,
+    db: Session = Depends(get_db),
+    current_user: schemas.TokenData = Depends(require_admin)
+):
+    """Queues an archive job now instead of waiting for the scheduled run."""
+    params = {"cutoff": archive_run.cutoff.isoformat()} if archive_run.cutoff else {}
+    return jobs.enqueue_job(db, "performance_archive", params=params, created_by=current_user.username)
+
+
+@router.post("/restore", response_model=schemas.Job, status_code=status.HTTP_202_ACCEPTED)
+def restore_archive(
+    restore: schemas.ArchiveRestore,
+    db: Session = Depends(get_db),
+    current_user: schemas.TokenData = Depends(require_admin)
+):
+    """Queues a job moving matching archived records back to the hot table."""
+    params = {
+        "driver_id": restore.driver_id,
+        "start_date": restore.start_date.isoformat() if restore.start_date else None,
+        "end_date": restore.end_date.isoformat() if restore.end_date else None,
+    }
+    return jobs.enqueue_job(db, "performance_restore", params=params, created_by=current_user.username)
@@ -5,10 +5,13 @@ from sqlalchemy.orm import Session
 from datetime import timedelta
 
 # Import your utility functions with an absolute import
-from app.auth import verify_password, get_password_hash, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.auth import (
+    verify_and_update_password, get_password_hash, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES,
+    require_admin, hash_timings, password_hash_profile,
+)
 from app.database import get_db
 from app.models import User # Assuming User model has a 'role' field
-from app.schemas import Token, UserCreate # Assuming Token schema needs an update
+from app.schemas import Token, UserCreate, TokenData, HashStats # Assuming Token schema needs an update
 
 router = APIRouter()
 # routers/auth_routes.py
@@ -60,13 +63,21 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     Handles user login and returns an access token, including the user's role.
     """
     user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = (
+        verify_and_update_password(form_data.password, user.hashed_password) if user else (False, None)
+    )
+    if not verified:
         # This is where the 401 response comes from if credentials are bad
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # The stored hash used an outdated scheme or cost: store the upgraded one
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     # >>> CHANGE 3: Include the 'role' in the JWT payload
@@ -76,4 +87,13 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     )
     
     # >>> CHANGE 4: Return the 'role' to the frontend
-    return {"access_token": access_token, "token_type": "bearer", "role": user.role}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer", "role": user.role}
+
+
+@router.get("/hash-stats", response_model=HashStats)
+def get_hash_stats(current_user: TokenData = Depends(require_admin)):
+    """
+    Password hashing profile and time spent hashing since startup, for
+    capacity planning of the login endpoint.
+    """
+    return {"profile": password_hash_profile(), **hash_timings.snapshot()}
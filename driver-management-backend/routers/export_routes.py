@@ -0,0 +1,72 @@
+# routers/export_routes.py
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app import export, schemas
+from app.auth import get_current_user_from_token
+
+router = APIRouter()
+
+
+def _parse_driver_ids(driver_ids: Optional[str]) -> Optional[List[int]]:
+    if not driver_ids:
+        return None
+    try:
+        return [int(value) for value in driver_ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="driver_ids must be a comma-separated list of integers."
+        )
+
+
+def _check_compression(compression: str, allowed):
+    if compression not in allowed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"compression must be one of: {', '.join(allowed)}"
+        )
+
+
+@router.get("/performances.parquet")
+def export_performances_parquet(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    driver_ids: Optional[str] = None,
+    include_archived: bool = True,
+    compression: str = "zstd",
+    current_user: schemas.TokenData = Depends(get_current_user_from_token)
+):
+    """
+    Streams the performance history, joined with driver attributes, as a
+    Parquet file. Filter with start_date/end_date and comma-separated driver_ids.
+    """
+    _check_compression(compression, export.PARQUET_COMPRESSIONS)
+    batches = export.iter_performance_batches(start_date, end_date, _parse_driver_ids(driver_ids), include_archived)
+    return StreamingResponse(
+        export.stream_parquet(batches, compression),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": 'attachment; filename="performances.parquet"'},
+    )
+
+
+@router.get("/performances.arrows")
+def export_performances_arrow(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    driver_ids: Optional[str] = None,
+    include_archived: bool = True,
+    compression: str = "zstd",
+    current_user: schemas.TokenData = Depends(get_current_user_from_token)
+):
+    """Same as /export/performances.parquet, in the Arrow IPC streaming format."""
+    _check_compression(compression, export.ARROW_COMPRESSIONS)
+    batches = export.iter_performance_batches(start_date, end_date, _parse_driver_ids(driver_ids), include_archived)
+    return StreamingResponse(
+        export.stream_arrow(batches, compression),
+        media_type="application/vnd.apache.arrow.stream",
+        headers={"Content-Disposition": 'attachment; filename="performances.arrows"'},
+    )
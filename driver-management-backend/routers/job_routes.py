@@ -0,0 +1,142 @@
+# routers/job_routes.py
+import mimetypes
+import os
+import re
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from sqlalchemy.orm import Session
+
+from app import jobs, schemas
+from app.auth import get_current_user_from_token
+from app.database import get_db
+
+router = APIRouter()
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _get_job_or_404(db: Session, job_id: int, current_user: schemas.TokenData):
+    job = jobs.get_job(db, job_id)
+    # Users only see their own jobs; other users' jobs look the same as missing ones
+    if not job or (current_user.role != "admin" and job.created_by != current_user.username):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("", response_model=schemas.Job, status_code=status.HTTP_202_ACCEPTED)
+def create_job(
+    job_in: schemas.JobCreate,
+    db: Session = Depends(get_db),
+    current_user: schemas.TokenData = Depends(get_current_user_from_token)
+):
+    """
+    Queues a background job. The job runs in the app's worker pool; poll
+    GET /jobs/{id} for its status and progress.
+    """
+    if jobs.is_admin_only(job_in.job_type) and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    try:
+        return jobs.enqueue_job(
+            db,
+            job_type=job_in.job_type,
+            params=job_in.params,
+            max_attempts=job_in.max_attempts,
+            created_by=current_user.username,
+        )
+    except jobs.JobParamsError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{e}. Available job types: {', '.join(jobs.registered_job_types())}"
+        )
+
+
+@router.get("/{job_id}", response_model=schemas.Job)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: schemas.TokenData = Depends(get_current_user_from_token)
+):
+    return _get_job_or_404(db, job_id, current_user)
+
+
+@router.post("/{job_id}/cancel", response_model=schemas.Job)
+def cancel_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: schemas.TokenData = Depends(get_current_user_from_token)
+):
+    job = _get_job_or_404(db, job_id, current_user)
+    if job.status in jobs.FINISHED_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job has already finished with status '{job.status}'"
+        )
+    return jobs.cancel_job(db, job)
+
+
+@router.get("/{job_id}/download")
+def download_job_result(
+    job_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: Session = Depends(get_db),
+    current_user: schemas.TokenData = Depends(get_current_user_from_token)
+):
+    """
+    Downloads the file written by a finished job. Supports single
+    `Range: bytes=start-end` requests so large files can be resumed.
+    """
+    job = _get_job_or_404(db, job_id, current_user)
+    path = jobs.result_file_path(job)
+    if job.status != jobs.JOB_STATUS_SUCCEEDED or not path or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Job has no downloadable result")
+
+    filename = os.path.basename(path)
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    if not range_header:
+        return FileResponse(path, media_type=media_type, filename=filename, headers={"Accept-Ranges": "bytes"})
+
+    file_size = os.path.getsize(path)
+    match = _RANGE_RE.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                        headers={"Content-Range": f"bytes */{file_size}"})
+    start, end = match.groups()
+    if start == "":
+        # Suffix range: the last N bytes
+        start, end = max(0, file_size - int(end)), file_size - 1
+    else:
+        start, end = int(start), min(int(end) if end else file_size - 1, file_size - 1)
+    if start > end or start >= file_size:
+        return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                        headers={"Content-Range": f"bytes */{file_size}"})
+
+    def iter_range():
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    return StreamingResponse(
+        iter_range(),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers={
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{file_size}",
+            "Content-Length": str(end - start + 1),
+            "Content-Disposition": f'attachment; filename="{filename}"',
+        },
+    )
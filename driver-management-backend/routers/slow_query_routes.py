@@ -0,0 +1,24 @@
+# routers/slow_query_routes.py
+from fastapi import APIRouter, Depends, Response, status
+
+from app import schemas
+from app.auth import require_admin
+from app.slow_queries import slow_query_log
+
+router = APIRouter()
+
+
+@router.get("", response_model=schemas.SlowQueryLog)
+def get_slow_queries(current_user: schemas.TokenData = Depends(require_admin)):
+    """Recent statements over the slow-query threshold, with their EXPLAIN plans."""
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "strict": slow_query_log.strict,
+        "queries": slow_query_log.entries(),
+    }
+
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(current_user: schemas.TokenData = Depends(require_admin)):
+    slow_query_log.clear()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -35,6 +35,8 @@ const getStatusColors = (status: string) => {
 };
 
 // Helper function to calculate average rating
+// driver.performances only holds recent records: anything older than the
+// backend's archive cutoff (ARCHIVE_AFTER_DAYS) is left out.
 const getAverageRating = (performances: DriverPerformance[]): string => {
     if (!performances || performances.length === 0) {
         return 'N/A';
@@ -125,7 +127,7 @@ const ClientDriversView: React.FC = () => {
                                     <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Status</th>
                                     <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Car Model</th>
                                     <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">License Number</th>
-                                    <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Avg. Rating</th>
+                                    <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Recent Avg. Rating</th>
                                 </tr>
                             </thead>
                             <tbody className="bg-white divide-y divide-gray-200">
@@ -39,6 +39,20 @@ export const getDriverById = async (driverId: number) => {
   return response.data;
 };
 
+// Function to fetch several drivers in one request.
+// Returns { drivers, missing_ids }; drivers come back in the order of driverIds.
+export const getDriversByIds = async (driverIds: number[]) => {
+  // Long id lists are sent in the body to stay clear of URL length limits
+  if (driverIds.length > 50) {
+    const response = await api.post(`/drivers/batch`, { ids: driverIds });
+    return response.data;
+  }
+  const response = await api.get(`/drivers/batch`, {
+    params: { ids: driverIds.join(',') }
+  });
+  return response.data;
+};
+
 // Function to get a driver's performance history
 export const getDriverHistory = async (driverId: number) => {
   // Use 'api' and remove the authHeaders argument